@@ -1,14 +1,46 @@
+from bisect import bisect_right
+from contextlib import contextmanager
 from time import sleep
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import dolphin_memory_engine as dme
 
 from .memoryaccessor import Addr, AddrException, MemoryAccessor
 
 
+# Size of the blocks memory is read and cached in when caching is enabled
+PAGE_SIZE = 0x100
+
+# Valid 1MB regions of memory (MEM1 and MEM2), by address >> 20
+VALID_REGIONS = frozenset([*range(0x800, 0x818), *range(0x900, 0x940)])
+
+
 class DolphinMemoryAccessor(MemoryAccessor):
-    """MemoryAccessor implementation for a GC/Wii game in Dolphin Emulator"""
+    """MemoryAccessor implementation for a GC/Wii game in Dolphin Emulator
+
+    With caching enabled, memory is read in whole pages which are kept until
+    invalidate is called, so reads nearby each other only go to Dolphin once"""
+
+    # Cached pages by page number, None if caching is disabled
+    pages: Optional[Dict[int, bytes]]
+
+    # Number of batch contexts currently entered
+    batch_depth: int
+
+    # Start and end addresses prefetched in the current batch, sorted and with
+    # overlapping ranges merged
+    batch_ranges: List[Tuple[Addr, Addr]]
+
+    # Data of each range in batch_ranges by start address, missing until the
+    # first read needing it
+    batch_data: Dict[Addr, bytearray]
+
+    def __init__(self, cache: bool = False):
+        self.pages = {} if cache else None
+        self.batch_depth = 0
+        self.batch_ranges = []
+        self.batch_data = {}
 
-    def __init__(self):
         dme.hook()
         if not dme.is_hooked():
             print("DME not ready yet, sleeping")
@@ -17,14 +49,136 @@ class DolphinMemoryAccessor(MemoryAccessor):
                 dme.hook()
 
     def _validate_addr(self, addr: Addr):
-        return 0x8000_0000 <= addr <= 0x817F_FFFF or 0x9000_0000 <= addr <= 0x93FFFFFF
+        return (addr >> 20) in VALID_REGIONS
+
+    def _validate_range(self, addr: Addr, length: int):
+        return all(
+            region in VALID_REGIONS
+            for region in range(addr >> 20, ((addr + length - 1) >> 20) + 1)
+        )
 
     def read(self, addr: Addr, length: int) -> bytes:
         if not self._validate_addr(addr):
             raise AddrException(f"Read from unknown address 0x{addr:x}")
-        return dme.read_bytes(addr, length)
+        if len(self.batch_ranges) > 0:
+            data = self._read_batch(addr, length)
+            if data is not None:
+                return data
+        if self.pages is None:
+            return dme.read_bytes(addr, length)
+        return self._read_cached(addr, length)
+
+    def _read_cached(self, addr: Addr, length: int) -> bytes:
+        first = addr // PAGE_SIZE
+        last = (addr + length - 1) // PAGE_SIZE
+
+        # Fetch all missing pages in one read
+        missing = [page for page in range(first, last + 1) if page not in self.pages]
+        if len(missing) > 0:
+            start = missing[0]
+            data = dme.read_bytes(
+                start * PAGE_SIZE, (missing[-1] - start + 1) * PAGE_SIZE
+            )
+            for page in range(start, missing[-1] + 1):
+                offs = (page - start) * PAGE_SIZE
+                self.pages[page] = data[offs : offs + PAGE_SIZE]
+
+        offs = addr - first * PAGE_SIZE
+        if first == last:
+            return self.pages[first][offs : offs + length]
+        data = b"".join(self.pages[page] for page in range(first, last + 1))
+        return data[offs : offs + length]
+
+    def _read_batch(self, addr: Addr, length: int) -> Optional[bytes]:
+        """Reads from the prefetched data, if the range is inside it"""
+
+        i = bisect_right(self.batch_ranges, (addr, float("inf"))) - 1
+        if i < 0:
+            return None
+        start, end = self.batch_ranges[i]
+        if addr + length > end:
+            return None
+
+        data = self.batch_data.get(start)
+        if data is None:
+            data = bytearray(dme.read_bytes(start, end - start))
+            self.batch_data[start] = data
+
+        offs = addr - start
+        return bytes(memoryview(data)[offs : offs + length])
 
     def write(self, addr: Addr, data: bytes):
         if not self._validate_addr(addr):
             raise AddrException(f"Wrote to unknown address 0x{addr:x}")
         dme.write_bytes(addr, data)
+
+        if self.pages is not None:
+            first = addr // PAGE_SIZE
+            last = (addr + len(data) - 1) // PAGE_SIZE
+            for page in range(first, last + 1):
+                self.pages.pop(page, None)
+
+        # Update any part of the prefetched data that was overwritten
+        for base, batch_data in self.batch_data.items():
+            start = max(addr, base)
+            end = min(addr + len(data), base + len(batch_data))
+            if start < end:
+                batch_data[start - base : end - base] = data[start - addr : end - addr]
+
+    def invalidate(self):
+        """Discards all cached memory, for use when the game may have changed it"""
+
+        if self.pages is not None:
+            self.pages.clear()
+
+        # Keep the prefetched ranges so they're read again on the next read
+        self.batch_data.clear()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Context where reads inside the ranges passed to prefetch are served
+        from a single read of memory per range
+
+        Nested batches share the ranges of the outermost one"""
+
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.batch_ranges.clear()
+                self.batch_data.clear()
+
+    def prefetch(self, addr: Addr, length: int):
+        """Adds a range to be read in one go in the current batch, merged with
+        any prefetched ranges it overlaps
+
+        Does nothing outside of a batch"""
+
+        if self.batch_depth == 0:
+            return
+
+        if not self._validate_range(addr, length):
+            raise AddrException(f"Prefetch of unknown range 0x{addr:x}+0x{length:x}")
+
+        start = addr
+        end = addr + length
+        ranges = []
+        merged = []
+        for batch_range in self.batch_ranges:
+            if batch_range[1] < start or batch_range[0] > end:
+                ranges.append(batch_range)
+            else:
+                start = min(start, batch_range[0])
+                end = max(end, batch_range[1])
+                merged.append(batch_range)
+
+        # Fetch again on the next read if the range grew
+        for batch_range in merged:
+            if batch_range != (start, end):
+                self.batch_data.pop(batch_range[0], None)
+
+        ranges.append((start, end))
+        ranges.sort()
+        self.batch_ranges = ranges
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
 
 from .memoryaccessor import Addr, AddrException, MemoryAccessor
 
@@ -7,53 +8,150 @@ from .memoryaccessor import Addr, AddrException, MemoryAccessor
 # Path, base address
 MemoryFileDef = Tuple[str, int]
 
+# Granularity of tracking changes to save
+PAGE_SIZE = 0x1000
+
 
 @dataclass
 class MemoryFile:
-    """Internal handling of an addressed file"""
+    """Internal handling of one or more addressed files contiguous in memory"""
 
-    path: str
+    # Path and length of each file, in address order
+    parts: List[Tuple[str, int]]
     base_addr: int
     data: bytearray
 
+    # Pages written to since the last save, by offset // PAGE_SIZE
+    dirty: Set[int] = field(default_factory=set)
+
+    # Address after the end of the data
+    end_addr: int = field(init=False)
+
+    # View of data to read from with a single copy
+    view: memoryview = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.end_addr = self.base_addr + len(self.data)
+        self.view = memoryview(self.data)
+
     def __contains__(self, addr: Addr):
-        return self.base_addr <= addr < self.base_addr + len(self.data)
+        return self.base_addr <= addr < self.end_addr
+
+    def extend(self, path: str, data: bytes):
+        """Appends the data of a file directly after this one in memory"""
+
+        # The data can't be resized while viewed
+        self.view.release()
+        self.parts.append((path, len(data)))
+        self.data += data
+        self.end_addr += len(data)
+        self.view = memoryview(self.data)
 
     def read(self, addr: Addr, length: int) -> bytes:
         offs = addr - self.base_addr
-        return bytes(self.data[offs : offs + length])
+        return bytes(self.view[offs : offs + length])
+
+    def read_view(self, addr: Addr, length: int) -> memoryview:
+        offs = addr - self.base_addr
+        return self.view[offs : offs + length]
 
     def write(self, addr: Addr, data: bytes):
+        if addr + len(data) > self.end_addr:
+            raise AddrException(f"Wrote past end of file at 0x{addr:x}")
         offs = addr - self.base_addr
         self.data[offs : offs + len(data)] = data
+        self.dirty.update(
+            range(offs // PAGE_SIZE, (offs + len(data) - 1) // PAGE_SIZE + 1)
+        )
+
+    def _dirty_ranges(self) -> List[Tuple[int, int]]:
+        """Gets the start and end offsets of each run of dirty pages"""
+
+        ranges: List[Tuple[int, int]] = []
+        for page in sorted(self.dirty):
+            start = page * PAGE_SIZE
+            end = min(start + PAGE_SIZE, len(self.data))
+            if len(ranges) > 0 and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def save(self):
+        """Writes the changed parts of the data back to the files"""
+
+        ranges = self._dirty_ranges()
+        part_start = 0
+        for path, length in self.parts:
+            part_end = part_start + length
+            try:
+                with open(path, "r+b") as f:
+                    for start, end in ranges:
+                        start = max(start, part_start)
+                        end = min(end, part_end)
+                        if start < end:
+                            f.seek(start - part_start)
+                            f.write(self.data[start:end])
+            except FileNotFoundError:
+                with open(path, "wb") as f:
+                    f.write(self.data[part_start:part_end])
+            part_start = part_end
+        self.dirty.clear()
 
 
 class FileMemoryAccessor(MemoryAccessor):
     """MemoryAccessor implementation for a RAM dump / regular binary file"""
 
+    # Sorted by base address, with files contiguous in memory merged together
     files: List[MemoryFile]
 
+    # Base address of each file, in the same order as files
+    bases: List[Addr]
+
     def __init__(self, *files: MemoryFileDef):
         self.files = []
-        for path, base_addr in files:
+        for path, base_addr in sorted(files, key=lambda file: file[1]):
             with open(path, "rb") as f:
                 dat = f.read()
-            self.files.append(MemoryFile(path, base_addr, bytearray(dat)))
+
+            if len(self.files) > 0 and self.files[-1].end_addr == base_addr:
+                self.files[-1].extend(path, dat)
+            else:
+                self.files.append(
+                    MemoryFile([(path, len(dat))], base_addr, bytearray(dat))
+                )
+        self.bases = [file.base_addr for file in self.files]
         # TODO: check overlap
 
+    def _find(self, addr: Addr) -> Optional[MemoryFile]:
+        """Finds the file containing an address"""
+
+        # The base address is known to be in range, only the end needs checking
+        i = bisect_right(self.bases, addr) - 1
+        if i >= 0:
+            file = self.files[i]
+            if addr < file.end_addr:
+                return file
+        return None
+
     def read(self, addr: Addr, length: int) -> bytes:
-        for file in self.files:
-            if addr in file:
-                return file.read(addr, length)
-        raise AddrException(f"Read from unknown address 0x{addr:x}")
+        file = self._find(addr)
+        if file is None:
+            raise AddrException(f"Read from unknown address 0x{addr:x}")
+        return file.read(addr, length)
+
+    def read_view(self, addr: Addr, length: int) -> memoryview:
+        file = self._find(addr)
+        if file is None:
+            raise AddrException(f"Read from unknown address 0x{addr:x}")
+        return file.read_view(addr, length)
 
     def write(self, addr: Addr, data: bytes):
-        for file in self.files:
-            if addr in file:
-                return file.write(addr, data)
-        raise AddrException(f"Wrote to unknown address 0x{addr:x}")
+        file = self._find(addr)
+        if file is None:
+            raise AddrException(f"Wrote to unknown address 0x{addr:x}")
+        file.write(addr, data)
 
     def save(self):
         for file in self.files:
-            with open(file.path, "wb") as f:
-                f.write(file.data)
+            file.save()
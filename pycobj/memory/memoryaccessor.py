@@ -20,3 +20,10 @@ class MemoryAccessor(ABC):
     @abstractmethod
     def write(self, addr: Addr, data: bytes):
         raise NotImplementedError
+
+    def read_view(self, addr: Addr, length: int) -> memoryview:
+        """Reads without copying where possible
+
+        The view is only valid until the next write"""
+
+        return memoryview(self.read(addr, length))
@@ -0,0 +1,40 @@
+from .memoryaccessor import Addr, MemoryAccessor
+
+
+class SnapshotMemoryAccessor(MemoryAccessor):
+    """MemoryAccessor serving a range of another accessor from a single read
+
+    Accesses outside of the range are passed through, writes inside it are
+    written through to the other accessor too"""
+
+    memory: MemoryAccessor
+    base_addr: Addr
+    data: bytearray
+
+    def __init__(self, memory: MemoryAccessor, addr: Addr, length: int):
+        self.memory = memory
+        self.base_addr = addr
+        self.data = bytearray(memory.read(addr, length))
+
+    def read(self, addr: Addr, length: int) -> bytes:
+        offs = addr - self.base_addr
+        if offs < 0 or offs + length > len(self.data):
+            return self.memory.read(addr, length)
+        return bytes(memoryview(self.data)[offs : offs + length])
+
+    def read_view(self, addr: Addr, length: int) -> memoryview:
+        offs = addr - self.base_addr
+        if offs < 0 or offs + length > len(self.data):
+            return self.memory.read_view(addr, length)
+        return memoryview(self.data)[offs : offs + length]
+
+    def write(self, addr: Addr, data: bytes):
+        self.memory.write(addr, data)
+
+        # Update any part of the snapshot that was overwritten
+        start = max(addr, self.base_addr)
+        end = min(addr + len(data), self.base_addr + len(self.data))
+        if start < end:
+            self.data[start - self.base_addr : end - self.base_addr] = data[
+                start - addr : end - addr
+            ]
@@ -1,7 +1,21 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 import struct
-from typing import Dict, Generic, Self, Tuple, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Self,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from pycparser import c_ast as ca
 from m2c.c_types import (
@@ -16,6 +30,10 @@ from m2c.c_types import (
 )
 
 from .memory.memoryaccessor import Addr, MemoryAccessor
+from .memory.snapshotmemory import SnapshotMemoryAccessor
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 TypeName = str
@@ -23,6 +41,72 @@ TypeType = TypeVar("TypeType", bound="Type")
 CTypeType = TypeVar("CTypeType", bound=CType)
 
 
+# Struct formats for the integer sizes it supports, by signedness
+INT_FORMATS = {
+    True: {1: "b", 2: "h", 4: "i", 8: "q"},
+    False: {1: "B", 2: "H", 4: "I", 8: "Q"},
+}
+
+
+def int_struct(size: int, signed: bool) -> Optional[struct.Struct]:
+    """Gets a struct for packing an integer, if the size is supported"""
+
+    # TODO: don't assume endian
+    fmt = INT_FORMATS[signed].get(size)
+    if fmt is None:
+        return None
+    return struct.Struct(">" + fmt)
+
+
+def int_unpacker(size: int, signed: bool) -> Callable[[Any], Tuple[int]]:
+    """Gets a function unpacking an integer from the start of a buffer as a
+    1-tuple, like struct's unpack_from"""
+
+    s = int_struct(size, signed)
+    if s is not None:
+        return s.unpack_from
+
+    # TODO: don't assume endian
+    return lambda data: (int.from_bytes(data[:size], "big", signed=signed),)
+
+
+# Struct formats for the float sizes it supports
+FLOAT_FORMATS = {4: "f", 8: "d"}
+
+# TODO: unhardcode size
+POINTER_STRUCT = struct.Struct(">I")
+
+# Keywords making up primitive types, which are safe to create types for early
+PRIMITIVE_NAMES = frozenset(
+    ["void", "char", "short", "int", "long", "float", "double", "signed", "unsigned"]
+)
+
+
+def ctype_fingerprint(ctype: Union[CType, ca.Node]) -> Hashable:
+    """Gets a key that's equal for ctypes declaring the same type with the same name
+
+    Falls back to the node itself for anything not compared structurally"""
+
+    if isinstance(ctype, ca.TypeDecl):
+        return ("TypeDecl", ctype.declname, ctype_fingerprint(ctype.type))
+    if isinstance(ctype, ca.PtrDecl):
+        return ("PtrDecl", ctype_fingerprint(ctype.type))
+    if isinstance(ctype, ca.ArrayDecl):
+        if isinstance(ctype.dim, ca.Constant):
+            dim: Hashable = ctype.dim.value
+        elif isinstance(ctype.dim, ca.ID):
+            dim = ("ID", ctype.dim.name)
+        else:
+            dim = ctype.dim
+        return ("ArrayDecl", dim, ctype_fingerprint(ctype.type))
+    if isinstance(ctype, ca.IdentifierType):
+        return ("IdentifierType", *ctype.names)
+    if isinstance(ctype, (ca.Struct, ca.Union, ca.Enum)) and ctype.name:
+        return (ctype.__class__.__name__, ctype.name)
+
+    return ctype
+
+
 class TypeException(Exception):
     """Error finding a type or its property"""
 
@@ -36,11 +120,35 @@ class TypeSpace:
     typemap: TypeMap
 
     # Pool of pycobj type objects
+    # pycparser nodes hash and compare by identity, so lookups are already as
+    # cheap as keying by id(ctype)
     ctype_pool: Dict[CType, "Type"]
 
+    # Pool of pycobj type objects by ctype_fingerprint, shared between ctypes
+    # declaring the same type
+    canon_pool: Dict[Hashable, "Type"]
+
+    # Types for unresolved ctypes by id, holding the ctype so the id stays unique
+    ctype_id_pool: Dict[int, Tuple[CType, "Type"]]
+
     def __init__(self, *contexts: str):
         self.typemap = build_typemap([Path(path) for path in contexts], False)
         self.ctype_pool = {}
+        self.canon_pool = {}
+        self.ctype_id_pool = {}
+
+        self._add_primitives()
+
+    def _add_primitives(self):
+        """Creates the Types for typedefs of primitive types up front"""
+
+        for ctype in self.typemap.typedefs.values():
+            if (
+                isinstance(ctype, ca.TypeDecl)
+                and isinstance(ctype.type, ca.IdentifierType)
+                and PRIMITIVE_NAMES.issuperset(ctype.type.names)
+            ):
+                self.get_from_ctype(ctype)
 
     def parsed_struct(self, struct: Union[ca.Struct, ca.Union]) -> Struct:
         if struct.name and struct.name in self.typemap.structs:
@@ -52,10 +160,16 @@ class TypeSpace:
     def _from_ctype(self, ctype: CType):
         """Gets the Type for a ctype, creating it if needed"""
 
-        if ctype not in self.ctype_pool:
-            self.ctype_pool[ctype] = Type.new(self, ctype)
+        t = self.ctype_pool.get(ctype)
+        if t is None:
+            key = ctype_fingerprint(ctype)
+            t = self.canon_pool.get(key)
+            if t is None:
+                t = Type.new(self, ctype)
+                self.canon_pool[key] = t
+            self.ctype_pool[ctype] = t
 
-        return self.ctype_pool[ctype]
+        return t
 
     def get(self, name: TypeName) -> "Type":
         """Gets the Type for a name"""
@@ -70,8 +184,13 @@ class TypeSpace:
     def get_from_ctype(self, ctype: CType) -> "Type":
         """Gets the Type for a ctype"""
 
-        ctype = resolve_typedefs(ctype, self.typemap)
-        return self._from_ctype(ctype)
+        cached = self.ctype_id_pool.get(id(ctype))
+        if cached is not None:
+            return cached[1]
+
+        t = self._from_ctype(resolve_typedefs(ctype, self.typemap))
+        self.ctype_id_pool[id(ctype)] = (ctype, t)
+        return t
 
     def get_from_var(self, name: str) -> "Type":
         """Gets the type from a global variable"""
@@ -79,8 +198,7 @@ class TypeSpace:
         ctype = self.typemap.var_types.get(name)
         if ctype is None:
             raise TypeException(f"Variable {name} not found")
-        ctype = resolve_typedefs(ctype, self.typemap)
-        return self._from_ctype(ctype)
+        return self.get_from_ctype(ctype)
 
     def enum(self, val_name: str) -> int:
         """Gets the value of a global enum constant"""
@@ -91,6 +209,8 @@ class TypeSpace:
 class Type(ABC, Generic[CTypeType]):
     """Pycobj wrapper for a type"""
 
+    __slots__ = ("typespace", "ctype", "size", "name")
+
     typespace: TypeSpace
     ctype: CTypeType
     size: int
@@ -113,28 +233,23 @@ class Type(ABC, Generic[CTypeType]):
     def new(cls, typespace: TypeSpace, ctype: CTypeType) -> "Type[CTypeType]":
         """Creates the Type object for a CType"""
 
-        if isinstance(ctype, ca.TypeDecl):
-            if isinstance(ctype.type, (ca.Struct, ca.Union)):
-                ret_cls = StructUnionType
-            elif isinstance(ctype.type, (ca.Enum)):
-                ret_cls = EnumType
-            elif isinstance(ctype.type, ca.IdentifierType):
-                if any(t in ctype.type.names for t in ("float", "double")):
+        if type(ctype) is ca.TypeDecl:
+            inner = ctype.type
+            if type(inner) is ca.IdentifierType:
+                if any(t in inner.names for t in ("float", "double")):
                     ret_cls = FloatType
-                elif "void" in ctype.type.names:
+                elif "void" in inner.names:
                     ret_cls = VoidType
                 else:
                     ret_cls = IntegerType
             else:
-                raise NotImplementedError(ctype.type)
-        elif isinstance(ctype, ca.ArrayDecl):
-            ret_cls = ArrayType
-        elif isinstance(ctype, ca.PtrDecl):
-            ret_cls = PointerType
-        elif isinstance(ctype, ca.FuncDecl):
-            ret_cls = FunctionType
+                ret_cls = TYPEDECL_CLASSES.get(type(inner))
+                if ret_cls is None:
+                    raise NotImplementedError(inner)
         else:
-            raise NotImplementedError(ctype)
+            ret_cls = CTYPE_CLASSES.get(type(ctype))
+            if ret_cls is None:
+                raise NotImplementedError(ctype)
 
         return ret_cls(typespace, ctype)  # type: ignore
 
@@ -153,13 +268,23 @@ class Type(ABC, Generic[CTypeType]):
 class IntegerType(Type[ca.TypeDecl]):
     """Wrapper for an integer type"""
 
+    __slots__ = ("signed", "_struct", "_unpack")
+
     signed: bool
 
+    # Cached packing for standard sizes, None to fall back to int.from_bytes
+    _struct: Optional[struct.Struct]
+
+    # Reader chosen for the size, so reading needs no checks
+    _unpack: Callable[[Any], Tuple[int]]
+
     def __init__(self, typespace: TypeSpace, ctype: ca.TypeDecl):
         size = primitive_size(ctype.type)
         super().__init__(typespace, ctype, size)
 
         self.signed = "signed" in self.ctype.type.names
+        self._struct = int_struct(self.size, self.signed)
+        self._unpack = int_unpacker(self.size, self.signed)
 
     def make_object(self, memory: MemoryAccessor, addr: Addr) -> "IntegerObject":
         return IntegerObject(self, memory, addr)
@@ -168,10 +293,17 @@ class IntegerType(Type[ca.TypeDecl]):
 class FloatType(Type[ca.TypeDecl]):
     """Wrapper for a float type"""
 
+    __slots__ = ("_struct",)
+
+    _struct: struct.Struct
+
     def __init__(self, typespace: TypeSpace, ctype: ca.TypeDecl):
         size = primitive_size(ctype.type)
         super().__init__(typespace, ctype, size)
 
+        # TODO: don't assume endian
+        self._struct = struct.Struct(">" + FLOAT_FORMATS[self.size])
+
     def make_object(self, memory: MemoryAccessor, addr: Addr) -> "FloatObject":
         return FloatObject(self, memory, addr)
 
@@ -179,9 +311,17 @@ class FloatType(Type[ca.TypeDecl]):
 class EnumType(Type[ca.TypeDecl]):
     """Unfinished"""
 
+    __slots__ = ("names", "values", "_struct", "_unpack")
+
     names: Dict[int, str]
     values: Dict[str, int]
 
+    # Cached packing for standard sizes, None to fall back to int.from_bytes
+    _struct: Optional[struct.Struct]
+
+    # Reader chosen for the size, so reading needs no checks
+    _unpack: Callable[[Any], Tuple[int]]
+
     def __init__(self, typespace: TypeSpace, ctype: ca.TypeDecl):
         size = primitive_size(ctype.type)
         super().__init__(typespace, ctype, size)
@@ -189,6 +329,8 @@ class EnumType(Type[ca.TypeDecl]):
         enum = self.typespace.typemap.enums[self.ctype.type]
         self.names = enum.names
         self.values = {name: value for value, name in self.names.items()}
+        self._struct = int_struct(self.size, False)
+        self._unpack = int_unpacker(self.size, False)
 
     def make_object(self, memory: MemoryAccessor, addr: Addr) -> "EnumObject":
         return EnumObject(self, memory, addr)
@@ -197,32 +339,235 @@ class EnumType(Type[ca.TypeDecl]):
 class StructUnionType(Type[ca.TypeDecl]):
     """Wrapper for a struct or union type"""
 
-    fields: Dict[str, Tuple[int, CType]]
+    __slots__ = (
+        "_parsed",
+        "_fields",
+        "_resolved",
+        "_paths",
+        "_decoder",
+        "_object_cls",
+    )
+
+    # M2C parsing of the struct
+    _parsed: Struct
+
+    # Offset and ctype of each field, built on first use
+    _fields: Optional[Dict[str, Tuple[int, CType]]]
+
+    # Offset and Type of each field, filled on first use since resolving field
+    # types in __init__ would recurse forever on self-referencing structs
+    _resolved: Dict[str, Tuple[int, Type]]
+
+    # Total offset and Type of paths through nested fields, filled on first use
+    _paths: Dict[Tuple[str, ...], Tuple[int, Type]]
+
+    # Generated function decoding the fields from a buffer, made on first use
+    _decoder: Optional[Callable[[bytes, int], Dict[str, Any]]]
+
+    # Generated StructUnionObject subclass with a property per field, made on
+    # first use
+    _object_cls: Optional[type]
 
     def __init__(self, typespace: TypeSpace, ctype: ca.TypeDecl):
-        parsed = typespace.parsed_struct(ctype.type)
+        self._parsed = typespace.parsed_struct(ctype.type)
+
+        super().__init__(typespace, ctype, self._parsed.size)
+
+        self._fields = None
+        self._resolved = {}
+        self._paths = {}
+        self._decoder = None
+        self._object_cls = None
+
+    @property
+    def fields(self) -> Dict[str, Tuple[int, CType]]:
+        """Offset and ctype of each field"""
+
+        if self._fields is None:
+            self._fields = {}
+            for offset, fields in self._parsed.fields.items():
+                for field in fields:
+                    self._fields[field.name] = (offset, field.type)
+
+        return self._fields
+
+    def resolve_field(self, name: str) -> Optional[Tuple[int, Type]]:
+        """Gets the offset and Type of a field, or None if it doesn't exist"""
+
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            field = self.fields.get(name)
+            if field is None:
+                return None
+            offset, ctype = field
+            resolved = (offset, self.typespace.get_from_ctype(ctype))
+            self._resolved[name] = resolved
+
+        return resolved
+
+    def resolve_path(self, path: Tuple[str, ...]) -> Tuple[int, Type]:
+        """Gets the total offset and Type of a field nested through structs"""
+
+        resolved = self._paths.get(path)
+        if resolved is None:
+            offset = 0
+            t: Type = self
+            for name in path:
+                field = None
+                if isinstance(t, StructUnionType):
+                    field = t.resolve_field(name)
+                if field is None:
+                    raise TypeException(f"{t} has no field {name}")
+                offset += field[0]
+                t = field[1]
+            resolved = (offset, t)
+            self._paths[path] = resolved
+
+        return resolved
+
+    def decode(self, buf: bytes, offset: int = 0) -> Dict[str, Any]:
+        """Decodes the values of the fields from the struct's memory in a buffer
+
+        Nested structs and arrays are decoded into dicts and lists, fields of
+        other types are left out"""
+
+        if self._decoder is None:
+            self._decoder = self._generate_decoder()
+
+        return self._decoder(buf, offset)
+
+    def get_path(self, object: "StructUnionObject", *names: str) -> "Object":
+        """Gets a field of an object of this type nested through structs, such as
+        get_path(obj, "a", "b") for obj.a.b, without creating the objects in
+        between"""
+
+        offset, t = self.resolve_path(names)
+        return t.make_object(object._memory, object._addr + offset)
 
-        super().__init__(typespace, ctype, parsed.size)
+    def read_all(self, object: "StructUnionObject") -> bytes:
+        """Reads the whole of an object of this type in a single access"""
 
-        self.fields = {}
-        for offset, fields in parsed.fields.items():
-            for field in fields:
-                self.fields[field.name] = (offset, field.type)
+        return object._memory.read(object._addr, self.size)
+
+    def snapshot(self, object: "StructUnionObject") -> "StructUnionObject":
+        """Gets an object of this type backed by a single read of the whole struct
+
+        Field reads are then served locally, which is much faster for memory
+        where each access is slow (such as live Dolphin memory)"""
+
+        memory = SnapshotMemoryAccessor(object._memory, object._addr, self.size)
+        return self.make_object(memory, object._addr)
+
+    def decode_object(self, object: "StructUnionObject") -> Dict[str, Any]:
+        """Reads the whole of an object of this type in a single access and
+        decodes its fields"""
+
+        return self.decode(self.read_all(object))
+
+    def _generate_decoder(self) -> Callable[[bytes, int], Dict[str, Any]]:
+        """Generates a function decoding the fields with their offsets inlined
+
+        Scalar fields that don't overlap are all unpacked with a single struct"""
+
+        namespace: Dict[str, Any] = {}
+        fields = sorted(
+            ((name, *self.resolve_field(name)) for name in self.fields),  # type: ignore
+            key=lambda field: field[1],
+        )
+
+        # TODO: don't assume endian
+        fmt = ">"
+        end = 0
+        count = 0
+        items = []
+        for name, offset, t in fields:
+            s = _scalar_struct(t)
+            if s is not None and offset >= end:
+                fmt += f"{offset - end}x{s.format[1:]}"
+                end = offset + s.size
+                expr: Optional[str] = _scalar_expr(t, f"values[{count}]", namespace)
+                count += 1
+            else:
+                expr = _decode_expr(t, f"base + {offset}", namespace, 0)
+            if expr is not None:
+                items.append(f"{name!r}: {expr}")
+
+        src = "def decode(buf, base):\n"
+        if count > 0:
+            namespace["_unpack"] = struct.Struct(fmt).unpack_from
+            src += "    values = _unpack(buf, base)\n"
+        src += f"    return {{{', '.join(items)}}}\n"
+        exec(src, namespace)
+        return namespace["decode"]
+
+    def _generate_object_cls(self) -> type:
+        """Generates a StructUnionObject subclass with a property per field, so
+        that field access doesn't go through __getattr__
+
+        Fields already resolved get a property with their offset and Type
+        inlined, others resolve on first access and then replace their property
+        with an inlined one"""
+
+        cls = type("StructUnionObject", (StructUnionObject,), {"__slots__": ()})
+        for name in self.fields:
+            # Fields can't be reached through __getattr__ if they clash with an
+            # existing attribute, so keep it that way
+            if hasattr(StructUnionObject, name):
+                continue
+
+            if name in self._resolved:
+                prop = self._inline_field_property(name)
+            else:
+                prop = _field_property(name)
+            setattr(cls, name, prop)
+
+        return cls
+
+    def _inline_field_property(self, name: str) -> property:
+        """Generates a property accessing a field with its offset and Type
+        inlined"""
+
+        offset, t = self.resolve_field(name)  # type: ignore
+        namespace: Dict[str, Any] = {"_make_object": t.make_object}
+        exec(
+            "def get(self):\n"
+            f"    return _make_object(self._memory, self._addr + {offset})\n",
+            namespace,
+        )
+        return property(namespace["get"])
 
     def make_object(self, memory: MemoryAccessor, addr: Addr) -> "StructUnionObject":
-        return StructUnionObject(self, memory, addr)
+        if self._object_cls is None:
+            self._object_cls = self._generate_object_cls()
+
+        return self._object_cls(self, memory, addr)
 
 
 class ArrayType(Type[ca.ArrayDecl]):
     """Wrapper for an array type"""
 
+    __slots__ = ("item_type", "length", "_stride", "_bulk_struct")
+
     item_type: Type
     length: int
 
+    # Distance between items
+    _stride: int
+
+    # Struct unpacking every item at once, None if the items aren't primitives
+    _bulk_struct: Optional[struct.Struct]
+
     def __init__(self, typespace: TypeSpace, ctype: ca.ArrayDecl):
         self.length = parse_constant_int(ctype.dim, typespace.typemap)
         self.item_type = typespace.get_from_ctype(ctype.type)
-        super().__init__(typespace, ctype, self.length * self.item_type.size)
+        self._stride = self.item_type.size
+        super().__init__(typespace, ctype, self.length * self._stride)
+
+        self._bulk_struct = None
+        if isinstance(self.item_type, (IntegerType, FloatType, PointerType)):
+            s = _scalar_struct(self.item_type)
+            if s is not None:
+                self._bulk_struct = struct.Struct(f">{self.length}{s.format[1:]}")
 
     def __len__(self) -> int:
         return self.length
@@ -234,11 +579,12 @@ class ArrayType(Type[ca.ArrayDecl]):
 class PointerType(Type[ca.PtrDecl]):
     """Wrapper for a pointer type"""
 
+    __slots__ = ("item_type",)
+
     item_type: Type
 
     def __init__(self, typespace: TypeSpace, ctype: ca.PtrDecl):
-        # TODO: unhardcode size
-        super().__init__(typespace, ctype, 4)
+        super().__init__(typespace, ctype, POINTER_STRUCT.size)
         self.item_type = typespace.get_from_ctype(ctype.type)
 
     def make_object(self, memory: MemoryAccessor, addr: Addr) -> "PointerObject":
@@ -248,6 +594,8 @@ class PointerType(Type[ca.PtrDecl]):
 class FunctionType(Type[ca.FuncDecl]):
     """Wrapper for a function type"""
 
+    __slots__ = ()
+
     def __init__(self, typespace: TypeSpace, ctype: ca.FuncDecl):
         # TODO: unhardcode size
         super().__init__(typespace, ctype, 4)
@@ -257,6 +605,8 @@ class FunctionType(Type[ca.FuncDecl]):
 
 
 class VoidType(Type[ca.TypeDecl]):
+    __slots__ = ()
+
     def __init__(self, typespace: TypeSpace, ctype: ca.TypeDecl):
         super().__init__(typespace, ctype, 1)
 
@@ -264,9 +614,92 @@ class VoidType(Type[ca.TypeDecl]):
         return VoidObject(self, memory, addr)
 
 
-class Object(ABC, Generic[TypeType]):
+# Type classes by the class of the ctype
+CTYPE_CLASSES: Dict[type, type] = {
+    ca.ArrayDecl: ArrayType,
+    ca.PtrDecl: PointerType,
+    ca.FuncDecl: FunctionType,
+}
+
+# Type classes by the class of the type in a TypeDecl, other than IdentifierType
+TYPEDECL_CLASSES: Dict[type, type] = {
+    ca.Struct: StructUnionType,
+    ca.Union: StructUnionType,
+    ca.Enum: EnumType,
+}
+
+
+def _field_property(name: str) -> property:
+    """Makes a property resolving a field of a struct on first access, which
+    then replaces itself on the class with an inlined one"""
+
+    def get(self: "StructUnionObject") -> "Object":
+        prop = self._t._inline_field_property(name)
+        setattr(type(self), name, prop)
+        return prop.fget(self)  # type: ignore
+
+    return property(get)
+
+
+def _scalar_struct(t: Type) -> Optional[struct.Struct]:
+    """Gets the struct unpacking a type's value, if it's a scalar with one"""
+
+    if isinstance(t, PointerType):
+        return POINTER_STRUCT
+    if isinstance(t, (IntegerType, FloatType, EnumType)):
+        return t._struct
+    return None
+
+
+def _scalar_expr(t: Type, value: str, namespace: Dict[str, Any]) -> str:
+    """Generates an expression converting an unpacked value of a scalar type,
+    adding anything it uses to namespace"""
+
+    if isinstance(t, EnumType):
+        # Fall back to the number for values without a name
+        name = f"_name{len(namespace)}"
+        names = t.names
+        namespace[name] = lambda value: names.get(value, value)
+        return f"{name}({value})"
+
+    return value
+
+
+def _decode_expr(
+    t: Type, offset: str, namespace: Dict[str, Any], depth: int
+) -> Optional[str]:
+    """Generates an expression decoding a value of a type at an offset in buf,
+    adding anything it uses to namespace
+
+    Returns None if the type can't be decoded"""
+
+    s = _scalar_struct(t)
+    if s is not None:
+        unpack = f"_unpack{len(namespace)}"
+        namespace[unpack] = s.unpack_from
+        return _scalar_expr(t, f"{unpack}(buf, {offset})[0]", namespace)
+
+    if isinstance(t, StructUnionType):
+        decode = f"_decode{len(namespace)}"
+        namespace[decode] = t.decode
+        return f"{decode}(buf, {offset})"
+
+    if isinstance(t, ArrayType):
+        var = f"i{depth}"
+        item_offset = f"{offset} + {var} * {t.item_type.size}"
+        item = _decode_expr(t.item_type, item_offset, namespace, depth + 1)
+        if item is None:
+            return None
+        return f"[{item} for {var} in range({t.length})]"
+
+    return None
+
+
+class Object(Generic[TypeType]):
     """Instance of a type in a system"""
 
+    __slots__ = ("_t", "_memory", "_addr")
+
     _t: TypeType
     _memory: MemoryAccessor
     _addr: Addr
@@ -288,16 +721,22 @@ class Object(ABC, Generic[TypeType]):
 class IntegerObject(Object[IntegerType]):
     """Access an object as an integer"""
 
+    __slots__ = ()
+
     # TODO: don't assume endian
 
     @property
     def value(self) -> int:
-        data = self._memory.read(self._addr, self._t.size)
-        return int.from_bytes(data, "big", signed=self._t.signed)
+        t = self._t
+        return t._unpack(self._memory.read_view(self._addr, t.size))[0]
 
     @value.setter
     def value(self, value: int):
-        data = int.to_bytes(value, self._t.size, "big", signed=self._t.signed)
+        t = self._t
+        if t._struct is not None:
+            data = t._struct.pack(value)
+        else:
+            data = int.to_bytes(value, t.size, "big", signed=t.signed)
         self._memory.write(self._addr, data)
 
     def _extra_repr(self) -> str:
@@ -307,16 +746,19 @@ class IntegerObject(Object[IntegerType]):
 class FloatObject(Object[FloatType]):
     """Access an object as an integer"""
 
+    __slots__ = ()
+
     # TODO: don't assume endian
 
     @property
     def value(self) -> float:
-        data = self._memory.read(self._addr, self._t.size)
-        return struct.unpack(">f", data)[0]
+        t = self._t
+        data = self._memory.read_view(self._addr, t.size)
+        return t._struct.unpack_from(data)[0]
 
     @value.setter
     def value(self, value: float):
-        data = struct.pack(">f", value)
+        data = self._t._struct.pack(value)
         self._memory.write(self._addr, data)
 
     def _extra_repr(self) -> str:
@@ -328,16 +770,22 @@ class EnumObject(Object[EnumType]):
 
     Unfinished"""
 
+    __slots__ = ()
+
     # TODO: don't assume endian
 
     @property
     def int_value(self) -> int:
-        data = self._memory.read(self._addr, self._t.size)
-        return int.from_bytes(data, "big")
+        t = self._t
+        return t._unpack(self._memory.read_view(self._addr, t.size))[0]
 
     @int_value.setter
     def int_value(self, value: int):
-        data = int.to_bytes(value, self._t.size, "big")
+        t = self._t
+        if t._struct is not None:
+            data = t._struct.pack(value)
+        else:
+            data = int.to_bytes(value, t.size, "big")
         self._memory.write(self._addr, data)
 
     @property
@@ -352,52 +800,115 @@ class EnumObject(Object[EnumType]):
 class StructUnionObject(Object[StructUnionType]):
     """Access an object as a struct or union"""
 
+    __slots__ = ()
+
     def __getattr__(self, name: str) -> Object:
-        if name not in self._t.fields:
+        # Python probes for special attributes often, reject them cheaply as
+        # AttributeError so that hasattr, copy etc. work
+        if (name.startswith("__") and name.endswith("__")) or name in Object.__slots__:
+            raise AttributeError(name)
+
+        field = self._t.resolve_field(name)
+        if field is None:
+            if name.startswith("_"):
+                raise AttributeError(name)
             raise TypeException(f"{self} has no field {name}")
-        offset, ctype = self._t.fields[name]
-        t = self._t.typespace.get_from_ctype(ctype)
+        offset, t = field
         return t.make_object(self._memory, self._addr + offset)
 
 
 class ArrayObject(Object[ArrayType]):
     """Access an object as an array"""
 
+    __slots__ = ()
+
     def __getitem__(self, idx: int) -> Object:
-        offset = idx * self._t.item_type.size
-        return self._t.item_type.make_object(self._memory, self._addr + offset)
+        t = self._t
+        return t.item_type.make_object(self._memory, self._addr + idx * t._stride)
+
+    def __iter__(self) -> Iterator[Object]:
+        make_object = self._t.item_type.make_object
+        memory = self._memory
+        stride = self._t._stride
+        addr = self._addr
+        for _ in range(self._t.length):
+            yield make_object(memory, addr)
+            addr += stride
 
     def __len__(self) -> int:
         return len(self._t)
 
+    def as_list(self) -> List[Union[int, float]]:
+        """Reads an array of integers, floats or pointers in a single access"""
+
+        s = self._t._bulk_struct
+        if s is None:
+            raise TypeException(f"{self} is not an array of primitives")
+        return list(s.unpack(self._memory.read(self._addr, s.size)))
+
+    def values_np(self) -> "np.ndarray":
+        """Reads an array of integers or floats in a single access
+
+        Requires numpy, the returned array is read-only"""
+
+        import numpy as np
+
+        # TODO: don't assume endian
+        item_type = self._t.item_type
+        if isinstance(item_type, IntegerType) and item_type._struct is not None:
+            kind = "i" if item_type.signed else "u"
+        elif isinstance(item_type, FloatType):
+            kind = "f"
+        else:
+            raise TypeException(f"{self} is not an array of integers or floats")
+        dtype = f">{kind}{item_type.size}"
+
+        return np.frombuffer(self._memory.read(self._addr, self._t.size), dtype)
+
 
 class PointerObject(Object[PointerType]):
     """Access an object as a pointer"""
 
+    __slots__ = ()
+
     @property
     def value(self) -> int:
-        data = self._memory.read(self._addr, self._t.size)
-        return int.from_bytes(data, "big")
+        data = self._memory.read_view(self._addr, POINTER_STRUCT.size)
+        return POINTER_STRUCT.unpack_from(data)[0]
 
     @value.setter
     def value(self, value: int):
-        data = int.to_bytes(value, self._t.size, "big")
+        data = POINTER_STRUCT.pack(value)
         self._memory.write(self._addr, data)
 
     def deref(self) -> Object:
         return self._t.item_type.make_object(self._memory, self.value)
 
     def __getitem__(self, idx: int) -> Object:
-        addr = self.value + idx * self._t.item_type.size
-        return self._t.item_type.make_object(self._memory, addr)
+        item_type = self._t.item_type
+        addr = self.value + idx * item_type.size
+        return item_type.make_object(self._memory, addr)
+
+    def items(self, count: int) -> Iterator[Object]:
+        """Iterates over the first count objects pointed to, reading the pointer
+        only once"""
+
+        item_type = self._t.item_type
+        make_object = item_type.make_object
+        memory = self._memory
+        stride = item_type.size
+        addr = self.value
+        for _ in range(count):
+            yield make_object(memory, addr)
+            addr += stride
 
     def _extra_repr(self) -> str:
         return f" = 0x{self.value:x}"
 
 
 class FunctionObject(Object[FunctionType]):
-    pass
+    __slots__ = ()
 
 
 class VoidObject(Object[VoidType]):
-    pass
+    __slots__ = ()
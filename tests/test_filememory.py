@@ -0,0 +1,95 @@
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from pycobj.memory.filememory import PAGE_SIZE, FileMemoryAccessor
+from pycobj.memory.memoryaccessor import AddrException
+
+
+BASE = 0x8000_0000
+
+# Lengths of the two files, the second ending part way through a page
+LEN_A = PAGE_SIZE * 2
+LEN_B = PAGE_SIZE + 0x10
+
+
+def make_files(tmp_path: Path) -> Tuple[Path, Path, bytes, bytes]:
+    """Creates two files contiguous in memory, returning their paths and data"""
+
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    data_a = bytes(i & 0xFF for i in range(LEN_A))
+    data_b = bytes((i * 7) & 0xFF for i in range(LEN_B))
+    a.write_bytes(data_a)
+    b.write_bytes(data_b)
+    return a, b, data_a, data_b
+
+
+def test_merged(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(b), BASE + LEN_A), (str(a), BASE))
+
+    assert len(ram.files) == 1
+    assert ram.read(BASE + LEN_A - 2, 4) == data_a[-2:] + data_b[:2]
+
+
+def test_save_across_boundary(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(a), BASE), (str(b), BASE + LEN_A))
+
+    ram.write(BASE + LEN_A - 4, b"\xaa" * 8)
+    ram.save()
+
+    assert a.read_bytes() == data_a[:-4] + b"\xaa" * 4
+    assert b.read_bytes() == b"\xaa" * 4 + data_b[4:]
+
+
+def test_save_partial_last_page(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(a), BASE), (str(b), BASE + LEN_A))
+
+    ram.write(BASE + LEN_A + LEN_B - 2, b"\xbb\xbb")
+    ram.save()
+
+    assert a.read_bytes() == data_a
+    assert b.read_bytes() == data_b[:-2] + b"\xbb\xbb"
+
+
+def test_save_only_dirty_pages(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(a), BASE), (str(b), BASE + LEN_A))
+
+    ram.write(BASE, b"\xcc")
+
+    # Changes made to clean pages since loading should be left alone
+    with open(a, "r+b") as f:
+        f.seek(PAGE_SIZE)
+        f.write(b"\xdd")
+    ram.save()
+
+    expected = bytearray(data_a)
+    expected[0] = 0xCC
+    expected[PAGE_SIZE] = 0xDD
+    assert a.read_bytes() == expected
+    assert b.read_bytes() == data_b
+
+
+def test_save_deleted_file(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(a), BASE), (str(b), BASE + LEN_A))
+
+    ram.write(BASE, b"\xee")
+    b.unlink()
+    ram.save()
+
+    assert a.read_bytes() == b"\xee" + data_a[1:]
+    assert b.read_bytes() == data_b
+
+
+def test_write_past_end(tmp_path: Path):
+    a, b, data_a, data_b = make_files(tmp_path)
+    ram = FileMemoryAccessor((str(a), BASE), (str(b), BASE + LEN_A))
+
+    with pytest.raises(AddrException):
+        ram.write(BASE + LEN_A + LEN_B - 2, b"\x00" * 4)